@@ -18,12 +18,12 @@ Version: 1.0.0
 """
 
 from fastmcp import FastMCP
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal, Tuple
 from pydantic import BaseModel, Field
 from datetime import datetime
-import httpx
-import json
+from collections import OrderedDict
 import os
+import secrets
 
 # ============================================================================
 # PYDANTIC MODELS FOR STRUCTURED OUTPUTS
@@ -146,14 +146,69 @@ mcp = FastMCP(
     """
 )
 
+# The fixed 6-phase plan, built once and shared by every session
+MINTO_PHASES = (
+    "Phase 1: Initialization",
+    "Phase 2: SCQA Development",
+    "Phase 3: MECE Generation (with iterations)",
+    "Phase 4: Evidence Gathering",
+    "Phase 5: Synthesis & Output",
+    "Phase 6: Meta-Analysis"
+)
+
 # ============================================================================
 # GLOBAL STATE MANAGEMENT
 # ============================================================================
 
-analysis_sessions = {}
+class SessionStore:
+    """Session registry bounded to the most recently used sessions"""
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError(f"SessionStore maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._sessions: OrderedDict = OrderedDict()
+
+    def get(self, session_id: str, default=None):
+        """Look up a session and mark it as recently used"""
+        if session_id not in self._sessions:
+            return default
+        self._sessions.move_to_end(session_id)
+        return self._sessions[session_id]
+
+    def __setitem__(self, session_id: str, session) -> None:
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        # Evict the least recently used session once over capacity
+        if len(self._sessions) > self.maxsize:
+            self._sessions.popitem(last=False)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+def max_sessions_from_env() -> int:
+    """Read the session capacity from MCP_MAX_SESSIONS, rejecting unusable values"""
+    raw = os.getenv("MCP_MAX_SESSIONS", "1024")
+    try:
+        max_sessions = int(raw)
+    except ValueError:
+        raise ValueError(f"MCP_MAX_SESSIONS must be an integer, got {raw!r}") from None
+    if max_sessions < 1:
+        raise ValueError(f"MCP_MAX_SESSIONS must be at least 1, got {max_sessions}")
+    return max_sessions
+
+analysis_sessions = SessionStore(maxsize=max_sessions_from_env())
 
 class AnalysisSession:
     """Maintains state for a single Minto analysis session"""
+    __slots__ = (
+        "session_id", "input_text", "scqa", "mece", "opportunity_spaces",
+        "thinking_history", "evidence_sources", "sources_seen", "current_phase",
+        "created_at", "synthesis_inputs"
+    )
+
     def __init__(self, session_id: str, input_text: str):
         self.session_id = session_id
         self.input_text = input_text
@@ -162,8 +217,10 @@ class AnalysisSession:
         self.opportunity_spaces: List[OpportunitySpace] = []
         self.thinking_history: List[ThinkingStep] = []
         self.evidence_sources: List[Dict] = []
+        self.sources_seen: set = set()
         self.current_phase: int = 0
         self.created_at = datetime.now()
+        self.synthesis_inputs: Optional[Tuple[str, int]] = None
         
     def add_thought(self, thought: ThinkingStep):
         """Add a thinking step to history"""
@@ -185,6 +242,13 @@ class AnalysisSession:
             total_evidence_sources=len(self.evidence_sources)
         )
 
+def get_session(session_id: str) -> AnalysisSession:
+    """Fetch an active session or raise if it doesn't exist"""
+    session = analysis_sessions.get(session_id)
+    if session is None:
+        raise ValueError(f"Session {session_id} not found")
+    return session
+
 # ============================================================================
 # PHASE 1: INITIALIZATION & PLANNING
 # ============================================================================
@@ -207,7 +271,8 @@ async def initialize_minto_analysis(
         Session information and initial analysis plan
     """
     if session_id is None:
-        session_id = f"minto_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Random suffix keeps sessions started in the same second distinct
+        session_id = f"minto_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
     
     session = AnalysisSession(session_id, input_text)
     analysis_sessions[session_id] = session
@@ -234,16 +299,9 @@ async def initialize_minto_analysis(
     return {
         "session_id": session_id,
         "status": "initialized",
-        "phases_planned": [
-            "Phase 1: Initialization",
-            "Phase 2: SCQA Development",
-            "Phase 3: MECE Generation (with iterations)",
-            "Phase 4: Evidence Gathering",
-            "Phase 5: Synthesis & Output",
-            "Phase 6: Meta-Analysis"
-        ],
+        "phases_planned": list(MINTO_PHASES),
         "next_action": "Call develop_scqa_framework to begin Phase 2",
-        "thought_recorded": thought.dict()
+        "thought_recorded": thought.model_dump()
     }
 
 # ============================================================================
@@ -273,9 +331,7 @@ async def develop_scqa_framework(
     Returns:
         Complete SCQA framework with thinking steps documented
     """
-    session = analysis_sessions.get(session_id)
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
+    session = get_session(session_id)
     
     session.current_phase = 2
     thoughts = []
@@ -397,9 +453,9 @@ async def develop_scqa_framework(
     return {
         "session_id": session_id,
         "phase": "SCQA Development Complete",
-        "scqa": scqa.dict(),
+        "scqa": scqa.model_dump(),
         "thoughts_recorded": len(thoughts),
-        "thinking_steps": [t.dict() for t in thoughts],
+        "thinking_steps": [t.model_dump() for t in thoughts],
         "next_action": "Call generate_mece_framework to begin Phase 3"
     }
 
@@ -407,6 +463,15 @@ async def develop_scqa_framework(
 # PHASE 3: MECE GENERATION (WITH REVISIONS)
 # ============================================================================
 
+# Mechanism-based category skeleton: (name, core insight) per opportunity space
+MECE_CATEGORY_TEMPLATES = (
+    ("Component A", "First opportunity space identified"),
+    ("Component B", "Second opportunity space identified"),
+    ("Component C", "Third opportunity space identified"),
+    ("Component D", "Fourth opportunity space identified")
+)
+MECE_EVIDENCE_HYPOTHESES = ("Hypothesis 1", "Hypothesis 2", "Hypothesis 3")
+
 @mcp.tool()
 async def generate_mece_framework(
     session_id: str,
@@ -428,9 +493,7 @@ async def generate_mece_framework(
     Returns:
         Validated MECE framework with revision history
     """
-    session = analysis_sessions.get(session_id)
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
+    session = get_session(session_id)
     
     session.current_phase = 3
     
@@ -512,33 +575,13 @@ async def generate_mece_framework(
     # Generate 4 MECE categories (example - would be customized per domain)
     categories = [
         MECECategory(
-            name="Component A",
-            core_insight="First opportunity space identified",
-            opportunity_statement="Innovation opportunity in this component",
-            evidence_hypotheses=["Hypothesis 1", "Hypothesis 2", "Hypothesis 3"],
-            confidence="High"
-        ),
-        MECECategory(
-            name="Component B",
-            core_insight="Second opportunity space identified",
-            opportunity_statement="Innovation opportunity in this component",
-            evidence_hypotheses=["Hypothesis 1", "Hypothesis 2", "Hypothesis 3"],
-            confidence="High"
-        ),
-        MECECategory(
-            name="Component C",
-            core_insight="Third opportunity space identified",
-            opportunity_statement="Innovation opportunity in this component",
-            evidence_hypotheses=["Hypothesis 1", "Hypothesis 2", "Hypothesis 3"],
-            confidence="High"
-        ),
-        MECECategory(
-            name="Component D",
-            core_insight="Fourth opportunity space identified",
+            name=name,
+            core_insight=core_insight,
             opportunity_statement="Innovation opportunity in this component",
-            evidence_hypotheses=["Hypothesis 1", "Hypothesis 2", "Hypothesis 3"],
+            evidence_hypotheses=list(MECE_EVIDENCE_HYPOTHESES),
             confidence="High"
         )
+        for name, core_insight in MECE_CATEGORY_TEMPLATES
     ]
     
     validation = MECEValidation(
@@ -561,11 +604,11 @@ async def generate_mece_framework(
     return {
         "session_id": session_id,
         "phase": "MECE Generation Complete",
-        "mece": mece.dict(),
+        "mece": mece.model_dump(),
         "iterations_required": len(frameworks_tried),
         "frameworks_tried": frameworks_tried,
         "thoughts_recorded": len(thoughts),
-        "thinking_steps": [t.dict() for t in thoughts],
+        "thinking_steps": [t.model_dump() for t in thoughts],
         "next_action": "Call gather_evidence to begin Phase 4"
     }
 
@@ -596,9 +639,7 @@ async def gather_evidence(
     Returns:
         Evidence organized by MECE category with full citations
     """
-    session = analysis_sessions.get(session_id)
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
+    session = get_session(session_id)
     
     if not session.mece:
         raise ValueError("MECE framework must be generated first")
@@ -644,8 +685,16 @@ async def gather_evidence(
             for i in range(3)
         ]
         
-        evidence_by_category[category.name] = evidence_points
-        session.evidence_sources.extend([ep.dict() for ep in evidence_points])
+        # Serialize once; the session record and the response share the dicts
+        evidence_dicts = [ep.model_dump() for ep in evidence_points]
+        evidence_by_category[category.name] = evidence_dicts
+        
+        # Skip sources already recorded by an earlier gathering pass
+        for evidence in evidence_dicts:
+            source_key = (evidence["name"], evidence["url"])
+            if source_key not in session.sources_seen:
+                session.sources_seen.add(source_key)
+                session.evidence_sources.append(evidence)
     
     # Domain validation search
     thought_validation = ThinkingStep(
@@ -666,10 +715,10 @@ async def gather_evidence(
     return {
         "session_id": session_id,
         "phase": "Evidence Gathering Complete",
-        "evidence_by_category": {k: [e.dict() for e in v] for k, v in evidence_by_category.items()},
+        "evidence_by_category": evidence_by_category,
         "total_sources": len(session.evidence_sources),
         "thoughts_recorded": len(thoughts),
-        "thinking_steps": [t.dict() for t in thoughts],
+        "thinking_steps": [t.model_dump() for t in thoughts],
         "next_action": "Call synthesize_pyramid to begin Phase 5"
     }
 
@@ -698,35 +747,37 @@ async def synthesize_pyramid(
     Returns:
         Complete Minto pyramid analysis with all components
     """
-    session = analysis_sessions.get(session_id)
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
+    session = get_session(session_id)
     
     if not session.mece or not session.evidence_sources:
         raise ValueError("MECE framework and evidence must be generated first")
     
     session.current_phase = 5
     
-    # Create opportunity spaces
-    for category in session.mece.categories:
-        # In production, this would intelligently match evidence to categories
-        opportunity = OpportunitySpace(
-            category=category,
-            evidence=[
-                EvidencePoint(
-                    name=f"Evidence for {category.name}",
-                    source="Recent research (2024)",
-                    url="https://example.com",
-                    key_finding=f"Validates {category.name} opportunity",
-                    confidence="High",
-                    relevance_score=0.95
-                )
-                for _ in range(3)
-            ],
-            synthesis=f"Evidence strongly supports {category.name} as viable opportunity space",
-            strategic_implication=f"Organizations should explore {category.name} innovations"
-        )
-        session.opportunity_spaces.append(opportunity)
+    # Reuse the previous opportunity spaces unless the MECE framework or evidence count changed
+    synthesis_inputs = (session.mece.model_dump_json(), len(session.evidence_sources))
+    if session.synthesis_inputs != synthesis_inputs:
+        opportunity_spaces = []
+        for category in session.mece.categories:
+            # In production, this would intelligently match evidence to categories
+            # Placeholder evidence is identical per slot: validate once, then copy
+            evidence = EvidencePoint(
+                name=f"Evidence for {category.name}",
+                source="Recent research (2024)",
+                url="https://example.com",
+                key_finding=f"Validates {category.name} opportunity",
+                confidence="High",
+                relevance_score=0.95
+            )
+            opportunity = OpportunitySpace(
+                category=category,
+                evidence=[evidence.model_copy() for _ in range(3)],
+                synthesis=f"Evidence strongly supports {category.name} as viable opportunity space",
+                strategic_implication=f"Organizations should explore {category.name} innovations"
+            )
+            opportunity_spaces.append(opportunity)
+        session.opportunity_spaces = opportunity_spaces
+        session.synthesis_inputs = synthesis_inputs
     
     # Generate complete pyramid
     pyramid = session.get_pyramid()
@@ -747,21 +798,23 @@ async def synthesize_pyramid(
     session.add_thought(thought_synthesis)
     thoughts.append(thought_synthesis)
     
+    # Serialize once; the structured output and the response share the dict
+    pyramid_dict = pyramid.model_dump()
     outputs = {}
     
     if output_format in ["structured", "all"]:
-        outputs["structured"] = pyramid.dict()
+        outputs["structured"] = pyramid_dict
     
     if output_format in ["markdown", "all"]:
         outputs["markdown"] = generate_markdown_output(pyramid)
     
     if output_format in ["json", "all"]:
-        outputs["json"] = json.dumps(pyramid.dict(), indent=2)
+        outputs["json"] = pyramid.model_dump_json(indent=2)
     
     return {
         "session_id": session_id,
         "phase": "Synthesis Complete",
-        "pyramid": pyramid.dict(),
+        "pyramid": pyramid_dict,
         "outputs": outputs,
         "thoughts_recorded": len(thoughts),
         "next_action": "Call perform_meta_analysis to complete Phase 6"
@@ -771,6 +824,14 @@ async def synthesize_pyramid(
 # PHASE 6: META-ANALYSIS
 # ============================================================================
 
+# Process lessons reported by every meta-analysis
+META_ANALYSIS_LESSONS = (
+    "Revision capability enabled quality through iteration",
+    "Strategic tool transitions aligned with cognitive shifts",
+    "Evidence validation confirmed opportunity viability",
+    "Complete transparency supports reproducibility"
+)
+
 @mcp.tool()
 async def perform_meta_analysis(
     session_id: str
@@ -791,12 +852,23 @@ async def perform_meta_analysis(
     Returns:
         Complete meta-analysis with process insights
     """
-    session = analysis_sessions.get(session_id)
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
+    session = get_session(session_id)
     
     session.current_phase = 6
-    
+
+    # Tally tool usage and revisions in a single pass over the history
+    sequential_calls = search_calls = synthesis_calls = revisions = 0
+    for t in session.thinking_history:
+        tool = t.tool_used
+        if "sequential" in tool:
+            sequential_calls += 1
+        if "search" in tool or "tavily" in tool:
+            search_calls += 1
+        if "synthesis" in tool:
+            synthesis_calls += 1
+        if t.is_revision:
+            revisions += 1
+
     meta_analysis = {
         "process_summary": {
             "total_phases": 6,
@@ -806,22 +878,17 @@ async def perform_meta_analysis(
             "process_duration": str(datetime.now() - session.created_at)
         },
         "tool_orchestration": {
-            "sequential_thinking_calls": len([t for t in session.thinking_history if "sequential" in t.tool_used]),
-            "search_calls": len([t for t in session.thinking_history if "search" in t.tool_used or "tavily" in t.tool_used]),
-            "synthesis_calls": len([t for t in session.thinking_history if "synthesis" in t.tool_used])
+            "sequential_thinking_calls": sequential_calls,
+            "search_calls": search_calls,
+            "synthesis_calls": synthesis_calls
         },
         "revision_analysis": {
-            "revisions_made": len([t for t in session.thinking_history if t.is_revision]),
+            "revisions_made": revisions,
             "frameworks_tried": session.mece.previous_attempts if session.mece else [],
             "revision_effectiveness": "High - iterations led to optimal framework"
         },
         "confidence_progression": analyze_confidence_progression(session.thinking_history),
-        "lessons_learned": [
-            "Revision capability enabled quality through iteration",
-            "Strategic tool transitions aligned with cognitive shifts",
-            "Evidence validation confirmed opportunity viability",
-            "Complete transparency supports reproducibility"
-        ]
+        "lessons_learned": list(META_ANALYSIS_LESSONS)
     }
     
     # Add meta-analysis to session
@@ -833,7 +900,7 @@ async def perform_meta_analysis(
         "phase": "Meta-Analysis Complete",
         "meta_analysis": meta_analysis,
         "analysis_complete": True,
-        "final_pyramid": pyramid.dict()
+        "final_pyramid": pyramid.model_dump()
     }
 
 # ============================================================================
@@ -909,7 +976,7 @@ async def run_complete_minto_analysis(
 
 def generate_markdown_output(pyramid: MintoPyramid) -> str:
     """Generate markdown formatted output"""
-    md = f"""# Minto Pyramid Analysis
+    parts = [f"""# Minto Pyramid Analysis
 
 ## Executive Summary
 
@@ -947,10 +1014,15 @@ def generate_markdown_output(pyramid: MintoPyramid) -> str:
 
 ### Opportunity Spaces
 
-"""
+"""]
     
+    # Collect sections and join once instead of repeated string concatenation
     for idx, space in enumerate(pyramid.opportunity_spaces, 1):
-        md += f"""
+        evidence_lines = "".join(
+            f"- {evidence.name} ({evidence.source}) - {evidence.key_finding}\n"
+            for evidence in space.evidence
+        )
+        parts.append(f"""
 #### {idx}. {space.category.name}
 
 **Core Insight:** {space.category.core_insight}
@@ -958,13 +1030,12 @@ def generate_markdown_output(pyramid: MintoPyramid) -> str:
 **Opportunity:** {space.category.opportunity_statement}
 
 **Evidence:**
-"""
-        for evidence in space.evidence:
-            md += f"- {evidence.name} ({evidence.source}) - {evidence.key_finding}\n"
-        
-        md += f"\n**Strategic Implication:** {space.strategic_implication}\n\n"
+{evidence_lines}
+**Strategic Implication:** {space.strategic_implication}
+
+""")
     
-    return md
+    return "".join(parts)
 
 def analyze_confidence_progression(thoughts: List[ThinkingStep]) -> Dict[str, Any]:
     """Analyze how confidence evolved throughout the process"""
@@ -982,4 +1053,15 @@ def analyze_confidence_progression(thoughts: List[ThinkingStep]) -> Dict[str, An
 # ============================================================================
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        mcp.run(transport="stdio")
+    else:
+        # Prefer the libuv-based event loop when it's installed. FastMCP.run is a
+        # thin anyio.run wrapper, so hand anyio the loop choice directly rather
+        # than going through the deprecated uvloop.install() policy hook
+        import anyio
+        from functools import partial
+        
+        anyio.run(partial(mcp.run_async, "stdio"), backend_options={"use_uvloop": True})
@@ -0,0 +1,83 @@
+"""
+Session state tests that call the server directly
+"""
+
+import pytest
+import server
+from server import SessionStore
+
+async def prepare_session() -> str:
+    """Run the phases that precede evidence gathering"""
+    init = await server.initialize_minto_analysis("Test problem")
+    session_id = init["session_id"]
+    await server.develop_scqa_framework(session_id)
+    await server.generate_mece_framework(session_id)
+    return session_id
+
+@pytest.mark.asyncio
+async def test_initialize_generates_distinct_session_ids():
+    """Test back-to-back sessions don't overwrite each other"""
+    first = await server.initialize_minto_analysis("First")
+    second = await server.initialize_minto_analysis("Second")
+    
+    assert first["session_id"] != second["session_id"]
+    assert server.get_session(first["session_id"]).input_text == "First"
+    assert server.get_session(second["session_id"]).input_text == "Second"
+
+def test_session_store_evicts_least_recently_used():
+    """Test session registry stays bounded"""
+    store = SessionStore(maxsize=2)
+    store["a"] = "session a"
+    store["b"] = "session b"
+    store.get("a")  # Touch "a" so "b" becomes least recently used
+    store["c"] = "session c"
+    
+    assert len(store) == 2
+    assert "a" in store and "c" in store
+    assert store.get("b") is None
+
+def test_session_store_rejects_non_positive_maxsize():
+    """Test a store that would evict every session can't be created"""
+    with pytest.raises(ValueError):
+        SessionStore(maxsize=0)
+
+@pytest.mark.asyncio
+async def test_repeated_evidence_gathering_skips_known_sources():
+    """Test re-gathering evidence doesn't duplicate recorded sources"""
+    session_id = await prepare_session()
+    
+    first = await server.gather_evidence(session_id)
+    second = await server.gather_evidence(session_id)
+    
+    assert first["total_sources"] == 12
+    assert second["total_sources"] == 12
+    assert len(server.get_session(session_id).evidence_sources) == 12
+
+@pytest.mark.asyncio
+async def test_repeated_synthesis_reuses_opportunity_spaces():
+    """Test re-synthesizing an unchanged session doesn't duplicate spaces"""
+    session_id = await prepare_session()
+    await server.gather_evidence(session_id)
+    session = server.get_session(session_id)
+    
+    await server.synthesize_pyramid(session_id)
+    first_spaces = session.opportunity_spaces
+    result = await server.synthesize_pyramid(session_id)
+    
+    assert session.opportunity_spaces is first_spaces
+    assert len(result["pyramid"]["opportunity_spaces"]) == 4
+
+@pytest.mark.asyncio
+async def test_synthesis_rebuilds_after_in_place_mece_edit():
+    """Test editing the MECE framework in place invalidates the synthesis"""
+    session_id = await prepare_session()
+    await server.gather_evidence(session_id)
+    session = server.get_session(session_id)
+    
+    await server.synthesize_pyramid(session_id)
+    session.mece.categories[0].name = "Edited Category"
+    result = await server.synthesize_pyramid(session_id)
+    
+    spaces = result["pyramid"]["opportunity_spaces"]
+    assert len(spaces) == 4
+    assert "Edited Category" in spaces[0]["synthesis"]